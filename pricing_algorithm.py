@@ -3,30 +3,74 @@ ViralDeals Pricing Algorithm
 Intelligent markup prediction system for reselling business
 """
 
+import bisect
+import importlib.util
 import math
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
-from enum import Enum
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional, Union
+from dataclasses import dataclass, field
+from enum import IntEnum
 
-class ProductCategory(Enum):
+import numpy as np
+
+from pricing_kernel import jit_pricing_kernel
+
+# numba is optional and only imported when the JIT kernel is first needed;
+# without it the NumPy path is used instead
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+try:
+    # Ahead-of-time build of pricing_kernel, see pricing_ext_build.py
+    from pricing_ext import bulk_kernel as _aot_kernel, bulk_kernel_f32 as _aot_kernel_f32
+    AOT_AVAILABLE = True
+except ImportError:
+    AOT_AVAILABLE = False
+
+class _KeyedIntEnum(IntEnum):
+    """
+    IntEnum whose members double as array indices
+
+    Members still parse from, and serialise to, their lowercase string key
+    (e.g. "home_kitchen").
+    """
+    
+    @property
+    def key(self) -> str:
+        """String form used in product dicts and the web UI"""
+        return self.name.lower()
+    
+    @classmethod
+    def _missing_(cls, value):
+        # Only the exact lowercase keys parse, as with the old string values
+        if isinstance(value, str) and value == value.lower():
+            return cls.__members__.get(value.upper())
+        return None
+
+class ProductCategory(_KeyedIntEnum):
     """Product categories with different competitive pressures"""
-    ELECTRONICS = "electronics"
-    FASHION = "fashion"
-    HOME_KITCHEN = "home_kitchen"
-    BEAUTY = "beauty"
-    SPORTS = "sports"
-    BOOKS = "books"
-    TOYS = "toys"
-    GENERIC = "generic"
-
-class CompetitionLevel(Enum):
+    ELECTRONICS = 0
+    FASHION = 1
+    HOME_KITCHEN = 2
+    BEAUTY = 3
+    SPORTS = 4
+    BOOKS = 5
+    TOYS = 6
+    GENERIC = 7
+
+class CompetitionLevel(_KeyedIntEnum):
     """Market competition intensity"""
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    VERY_HIGH = "very_high"
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    VERY_HIGH = 3
 
-@dataclass
+# Members keyed by both member and string key, for parsing product dicts
+# without constructing enums per row
+_CATEGORY_BY_NAME = {**{c: c for c in ProductCategory}, **{c.key: c for c in ProductCategory}}
+_COMPETITION_BY_NAME = {**{c: c for c in CompetitionLevel}, **{c.key: c for c in CompetitionLevel}}
+
+@dataclass(slots=True, frozen=True)
 class CostFactors:
     """Additional costs that affect final pricing"""
     payment_gateway_fee: float = 0.02  # 2%
@@ -34,8 +78,30 @@ class CostFactors:
     packaging_cost: float = 10.0  # Fixed ₹10
     returns_buffer: float = 0.03  # 3%
     gst_rate: float = 0.18  # 18% (can vary by category)
+    # Sum of the fees charged as a fraction of the selling price
+    variable_rate: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(
+            self, 'variable_rate',
+            self.payment_gateway_fee + self.platform_fee + self.returns_buffer + self.gst_rate
+        )
+    
+    def total_costs(self, selling_price: float) -> float:
+        """Sum of all additional costs for a selling price"""
+        return selling_price * self.variable_rate + self.packaging_cost
+    
+    def cost_breakdown(self, selling_price: float) -> Dict[str, float]:
+        """Itemised additional costs for a selling price"""
+        return {
+            'payment_gateway': selling_price * self.payment_gateway_fee,
+            'platform_fee': selling_price * self.platform_fee,
+            'packaging': self.packaging_cost,
+            'returns_buffer': selling_price * self.returns_buffer,
+            'gst': selling_price * self.gst_rate,
+        }
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PricingResult:
     """Result of pricing calculation"""
     supplier_price: float
@@ -44,14 +110,138 @@ class PricingResult:
     selling_price: float
     final_price: float  # After psychological pricing
     profit_margin: float
-    cost_breakdown: Dict[str, float]
+    cost_factors: CostFactors = field(default_factory=CostFactors, repr=False)
+    
+    @property
+    def cost_breakdown(self) -> Dict[str, float]:
+        """
+        Itemised additional costs, built on each access
+
+        Nothing is cached (the class has slots), so each read returns a new
+        dict; keep a local copy when reading it repeatedly.
+        """
+        return self.cost_factors.cost_breakdown(self.selling_price)
+    
+    @property
+    def total_additional_costs(self) -> float:
+        """Sum of the additional costs, without building the breakdown"""
+        return self.cost_factors.total_costs(self.selling_price)
+    
+    def to_dict(self) -> Dict[str, object]:
+        """Plain dict with the result fields and the cost breakdown"""
+        return {
+            'supplier_price': self.supplier_price,
+            'base_markup_percent': self.base_markup_percent,
+            'adjusted_markup_percent': self.adjusted_markup_percent,
+            'selling_price': self.selling_price,
+            'final_price': self.final_price,
+            'profit_margin': self.profit_margin,
+            'cost_breakdown': self.cost_breakdown,
+        }
+
+# Column order of PricingResultBatch.costs, matching CostFactors.cost_breakdown
+COST_COLUMNS = ('payment_gateway', 'platform_fee', 'packaging', 'returns_buffer', 'gst')
+
+@dataclass(slots=True, frozen=True, eq=False)
+class PricingResultBatch:
+    """
+    Struct-of-arrays result of bulk pricing, one entry per product
+
+    Compares and hashes by identity, as element-wise array equality has no
+    single truth value.
+    """
+    supplier_price: np.ndarray
+    base_markup_percent: np.ndarray
+    adjusted_markup_percent: np.ndarray
+    selling_price: np.ndarray
+    final_price: np.ndarray
+    profit_margin: np.ndarray
+    costs: Optional[np.ndarray] = None  # shape (N, 5), columns as COST_COLUMNS
+    
+    def __len__(self) -> int:
+        return self.supplier_price.shape[0]
+    
+    def to_results(
+        self,
+        cost_factors: CostFactors,
+        supplier_prices: Optional[List[float]] = None,
+        integral_final_price: bool = False
+    ) -> List[PricingResult]:
+        """
+        Expand into one PricingResult per product
+
+        To match calculate_price, pass the caller's original
+        ``supplier_prices`` (kept as given rather than as floats) and set
+        ``integral_final_price`` when psychological pricing was applied, so
+        final prices come back as ints.
+        """
+        if supplier_prices is None:
+            supplier_prices = self.supplier_price.tolist()
+        final_prices = self.final_price.tolist()
+        if integral_final_price:
+            final_prices = [int(price) for price in final_prices]
+        return [
+            PricingResult(
+                supplier_price=supplier_prices[i],
+                base_markup_percent=float(self.base_markup_percent[i]),
+                adjusted_markup_percent=float(self.adjusted_markup_percent[i]),
+                selling_price=float(self.selling_price[i]),
+                final_price=final_prices[i],
+                profit_margin=float(self.profit_margin[i]),
+                cost_factors=cost_factors
+            )
+            for i in range(len(self))
+        ]
+
+def _load_jit_kernel():
+    """Numba JIT kernel, or None if numba is missing or fails to import"""
+    global NUMBA_AVAILABLE
+    if not NUMBA_AVAILABLE:
+        return None
+    try:
+        return jit_pricing_kernel()
+    except ImportError:
+        # Installed but unusable, e.g. built against another NumPy version
+        NUMBA_AVAILABLE = False
+        return None
+
+# Maximum number of memoised calculate_price results per instance
+_PRICE_CACHE_SIZE = 4096
+
+def _check_ids(cat_ids: np.ndarray, comp_ids: np.ndarray):
+    """Raise ValueError unless every id is a valid ProductCategory / CompetitionLevel"""
+    for ids, enum_cls in ((cat_ids, ProductCategory), (comp_ids, CompetitionLevel)):
+        if ids.size and (ids.min() < 0 or ids.max() >= len(enum_cls)):
+            raise ValueError(f"{enum_cls.__name__} ids must be in range 0..{len(enum_cls) - 1}")
+
+def _specialize_total_costs(cost_factors: CostFactors):
+    """
+    Build total_costs for one CostFactors with its rates inlined as literals
+
+    Rebuilt whenever an algorithm's cost_factors is assigned, so each call
+    skips the attribute loads. Values go through float() so only numeric
+    literals reach the generated source; non-finite values (whose repr is
+    a bare name such as nan) use the regular total_costs instead.
+    """
+    rate = float(cost_factors.variable_rate)
+    packaging = float(cost_factors.packaging_cost)
+    if not (math.isfinite(rate) and math.isfinite(packaging)):
+        return cost_factors.total_costs
+    source = (
+        "def _total_costs_fast(selling_price):\n"
+        f"    return selling_price * {rate!r} + {packaging!r}\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return namespace['_total_costs_fast']
 
 class ViralDealsPricingAlgorithm:
     """
     Intelligent pricing algorithm for ViralDeals reselling business
     """
     
-    # Base markup tiers as specified
+    # Base markup tiers as specified; each tier runs from its minimum up to
+    # the next tier's minimum, so fractional prices between tiers are covered
     BASE_MARKUP_TIERS = [
         (100, 299, 0.60),   # ₹100-₹299: +60%
         (300, 699, 0.45),   # ₹300-₹699: +45%
@@ -60,40 +250,72 @@ class ViralDealsPricingAlgorithm:
         (2001, float('inf'), 0.20)  # Above ₹2000: +20%
     ]
     
-    # Category adjustments (multipliers to base markup)
-    CATEGORY_ADJUSTMENTS = {
-        ProductCategory.ELECTRONICS: 0.85,      # Highly competitive
-        ProductCategory.FASHION: 1.15,          # Higher margins possible
-        ProductCategory.HOME_KITCHEN: 1.0,      # Standard
-        ProductCategory.BEAUTY: 1.2,            # Premium category
-        ProductCategory.SPORTS: 0.9,            # Competitive
-        ProductCategory.BOOKS: 0.7,             # Very competitive
-        ProductCategory.TOYS: 1.1,              # Good margins
-        ProductCategory.GENERIC: 1.0            # Standard
-    }
-    
-    # Competition level adjustments
-    COMPETITION_ADJUSTMENTS = {
-        CompetitionLevel.LOW: 1.2,
-        CompetitionLevel.MEDIUM: 1.0,
-        CompetitionLevel.HIGH: 0.85,
-        CompetitionLevel.VERY_HIGH: 0.7
-    }
+    # Markup below the lowest tier (under ₹100)
+    BELOW_TIERS_MARKUP = 0.70  # Higher markup for very low-cost items
+    
+    # Category adjustments (multipliers to base markup), indexed by ProductCategory
+    CATEGORY_ADJUSTMENTS = (
+        0.85,   # ELECTRONICS: Highly competitive
+        1.15,   # FASHION: Higher margins possible
+        1.0,    # HOME_KITCHEN: Standard
+        1.2,    # BEAUTY: Premium category
+        0.9,    # SPORTS: Competitive
+        0.7,    # BOOKS: Very competitive
+        1.1,    # TOYS: Good margins
+        1.0     # GENERIC: Standard
+    )
+    
+    # Competition level adjustments, indexed by CompetitionLevel
+    COMPETITION_ADJUSTMENTS = (
+        1.2,    # LOW
+        1.0,    # MEDIUM
+        0.85,   # HIGH
+        0.7     # VERY_HIGH
+    )
     
     def __init__(self, cost_factors: Optional[CostFactors] = None):
+        # Guards _price_cache so calculate_price can be called from several threads
+        self._price_lock = threading.Lock()
         self.cost_factors = cost_factors or CostFactors()
     
+    @property
+    def cost_factors(self) -> CostFactors:
+        """Cost factors in effect; assigning new ones rebuilds the derived state"""
+        return self._cost_factors
+    
+    @cost_factors.setter
+    def cost_factors(self, cost_factors: CostFactors):
+        self._cost_factors = cost_factors
+        self._rebuild_pricing_state()
+    
+    def _rebuild_pricing_state(self):
+        """Recompute everything derived from cost_factors and the class tables"""
+        # Tier lookup tables: _tier_markups[i] applies below _tier_edges[i],
+        # the last entry from the highest tier's minimum upwards
+        tiers = sorted(self.BASE_MARKUP_TIERS)
+        self._tier_edges = tuple(min_price for min_price, _, _ in tiers)
+        self._tier_markups = (self.BELOW_TIERS_MARKUP,) + tuple(markup for _, _, markup in tiers)
+        self._tier_edges_arr = np.array(self._tier_edges, dtype=np.float64)
+        self._tier_markups_arr = np.array(self._tier_markups, dtype=np.float64)
+        self._variable_rate = self.cost_factors.variable_rate
+        # Sum of all additional costs without the itemised breakdown
+        self._total_costs_fast = _specialize_total_costs(self.cost_factors)
+        # Combined category x competition multiplier, indexed by [category, competition]
+        self._adj = np.array([
+            [self.CATEGORY_ADJUSTMENTS[c] * self.COMPETITION_ADJUSTMENTS[k] for k in CompetitionLevel]
+            for c in ProductCategory
+        ], dtype=np.float64)
+        # Plain-float copy for the scalar path, where NumPy scalar indexing is slower
+        self._adj_rows = self._adj.tolist()
+        # Reports and UIs re-price the same inputs repeatedly. An LRU-ordered
+        # dict (rather than lru_cache over a bound method) avoids a reference
+        # cycle back to self.
+        with self._price_lock:
+            self._price_cache = OrderedDict()
+    
     def get_base_markup(self, supplier_price: float) -> float:
         """Get base markup percentage based on price tier"""
-        for min_price, max_price, markup in self.BASE_MARKUP_TIERS:
-            if min_price <= supplier_price <= max_price:
-                return markup
-        
-        # Fallback for prices outside defined ranges
-        if supplier_price < 100:
-            return 0.70  # Higher markup for very low-cost items
-        else:
-            return 0.15  # Conservative markup for very high-cost items
+        return self._tier_markups[bisect.bisect_right(self._tier_edges, supplier_price)]
     
     def calculate_adjusted_markup(
         self, 
@@ -104,57 +326,34 @@ class ViralDealsPricingAlgorithm:
     ) -> float:
         """Calculate adjusted markup based on various factors"""
         
-        adjusted_markup = base_markup
-        
-        # Apply category adjustment
-        adjusted_markup *= self.CATEGORY_ADJUSTMENTS[category]
-        
-        # Apply competition adjustment
-        adjusted_markup *= self.COMPETITION_ADJUSTMENTS[competition]
+        adjusted_markup = base_markup * self._adj_rows[category][competition]
         
         # Bonus for unique value proposition
         if has_unique_value:
             adjusted_markup *= 1.15
         
         # Ensure minimum markup of 15% for sustainability
-        return max(adjusted_markup, 0.15)
+        return adjusted_markup if adjusted_markup > 0.15 else 0.15
     
     def calculate_total_costs(self, supplier_price: float, selling_price: float) -> Dict[str, float]:
         """Calculate all additional costs"""
-        costs = {}
-        
-        # Payment gateway fee
-        costs['payment_gateway'] = selling_price * self.cost_factors.payment_gateway_fee
-        
-        # Platform fee
-        costs['platform_fee'] = selling_price * self.cost_factors.platform_fee
-        
-        # Fixed packaging cost
-        costs['packaging'] = self.cost_factors.packaging_cost
-        
-        # Returns buffer
-        costs['returns_buffer'] = selling_price * self.cost_factors.returns_buffer
-        
-        # GST (if applicable)
-        costs['gst'] = selling_price * self.cost_factors.gst_rate
-        
-        return costs
+        return self.cost_factors.cost_breakdown(selling_price)
     
     def apply_psychological_pricing(self, price: float) -> float:
         """Apply psychological pricing (ending in 9s)"""
-        if price < 100:
+        p = int(price)  # Whole rupees; prices are positive so this is floor
+        if p < 100:
             # For prices under ₹100, end with 9
-            return math.floor(price / 10) * 10 + 9
-        elif price < 1000:
+            return p // 10 * 10 + 9
+        hundreds = p // 100
+        if p < 1000:
             # For prices ₹100-999, end with 99
-            return math.floor(price / 100) * 100 + 99
-        else:
-            # For prices ₹1000+, end with 999 or 499
-            hundreds = math.floor(price / 100)
-            if hundreds % 10 < 5:
-                return hundreds * 100 - 1  # End with 999
-            else:
-                return (hundreds - hundreds % 10 + 4) * 100 + 99  # End with 499
+            return hundreds * 100 + 99
+        # For prices ₹1000+, end with 999 or 499
+        rem = hundreds % 10
+        if rem < 5:
+            return hundreds * 100 - 1  # End with 999
+        return (hundreds - rem + 4) * 100 + 99  # End with 499
     
     def calculate_price(
         self,
@@ -166,7 +365,40 @@ class ViralDealsPricingAlgorithm:
     ) -> PricingResult:
         """
         Main pricing calculation method
+
+        Results are memoised per instance on the full argument tuple in a
+        thread-safe LRU cache; PricingResult is frozen, so repeated calls
+        safely share one object.
         """
+        key = (supplier_price, category, competition, has_unique_value, apply_psychological)
+        with self._price_lock:
+            result = self._price_cache.get(key)
+            if result is not None:
+                self._price_cache.move_to_end(key)
+                return result
+        
+        # Compute outside the lock so threads pricing different products don't serialise
+        result = self._calculate_price(*key)
+        with self._price_lock:
+            self._price_cache[key] = result
+            if len(self._price_cache) > _PRICE_CACHE_SIZE:
+                self._price_cache.popitem(last=False)  # Least recently used
+        return result
+    
+    def _calculate_price(
+        self,
+        supplier_price: float,
+        category: ProductCategory,
+        competition: CompetitionLevel,
+        has_unique_value: bool,
+        apply_psychological: bool
+    ) -> PricingResult:
+        """Uncached body of calculate_price"""
+        
+        # Reject out-of-range ints, which would otherwise wrap around when
+        # indexing the adjustment table
+        category = ProductCategory(category)
+        competition = CompetitionLevel(competition)
         
         # Step 1: Get base markup
         base_markup = self.get_base_markup(supplier_price)
@@ -180,8 +412,7 @@ class ViralDealsPricingAlgorithm:
         selling_price = supplier_price * (1 + adjusted_markup)
         
         # Step 4: Calculate additional costs
-        cost_breakdown = self.calculate_total_costs(supplier_price, selling_price)
-        total_additional_costs = sum(cost_breakdown.values())
+        total_additional_costs = self._total_costs_fast(selling_price)
         
         # Step 5: Adjust for costs to maintain margin
         adjusted_selling_price = selling_price + total_additional_costs
@@ -200,21 +431,204 @@ class ViralDealsPricingAlgorithm:
             selling_price=selling_price,
             final_price=final_price,
             profit_margin=profit_margin,
-            cost_breakdown=cost_breakdown
+            cost_factors=self.cost_factors
+        )
+    
+    def bulk_calculate_arrays(
+        self,
+        supplier_prices: np.ndarray,
+        cat_ids: np.ndarray,
+        comp_ids: np.ndarray,
+        unique: np.ndarray,
+        apply_psychological: bool = True,
+        as_results: bool = False,
+        include_costs: bool = False,
+        dtype: np.dtype = np.float64
+    ) -> Union[PricingResultBatch, List[PricingResult]]:
+        """
+        Vectorized pricing over struct-of-arrays input
+
+        ``cat_ids`` and ``comp_ids`` hold each product's ProductCategory /
+        CompetitionLevel as integers.
+        Returns a PricingResultBatch (with the (N, 5) ``costs`` matrix if
+        ``include_costs`` is set), or PricingResult objects if ``as_results``
+        is set.
+
+        Pass ``dtype=np.float32`` to halve memory traffic on large batches;
+        a price landing within float32 rounding of a psychological pricing
+        boundary may then round to the neighbouring price point.
+        """
+        dtype = np.dtype(dtype)
+        sp = np.asarray(supplier_prices, dtype=dtype)
+        cat_ids = np.asarray(cat_ids)
+        comp_ids = np.asarray(comp_ids)
+        unique = np.asarray(unique, dtype=bool)
+        _check_ids(cat_ids, comp_ids)
+        
+        # Step 1: Base markup per price tier
+        tier_markups = self._tier_markups_arr.astype(dtype, copy=False)
+        base_markup = tier_markups[np.searchsorted(self._tier_edges_arr, sp, side='right')]
+        
+        # Step 2: Category, competition and unique value adjustments
+        adjusted_markup = (
+            base_markup
+            * self._adj.astype(dtype, copy=False)[cat_ids, comp_ids]
+            * np.where(unique, dtype.type(1.15), dtype.type(1.0))
+        )
+        adjusted_markup = np.maximum(adjusted_markup, 0.15)
+        
+        # Step 3: Selling price
+        selling_price = sp * (1 + adjusted_markup)
+        
+        # Step 4: Additional costs
+        total_additional_costs = (
+            selling_price * self._variable_rate + self.cost_factors.packaging_cost
+        )
+        
+        # Step 5: Adjust for costs
+        adjusted_selling_price = selling_price + total_additional_costs
+        
+        # Step 6: Psychological pricing
+        if apply_psychological:
+            final_price = self.apply_psychological_pricing_array(adjusted_selling_price)
+        else:
+            final_price = adjusted_selling_price
+        
+        # Step 7: Profit margin
+        profit = final_price - sp - total_additional_costs
+        safe_price = np.where(final_price > 0, final_price, 1.0)
+        profit_margin = np.where(final_price > 0, profit / safe_price * 100, 0.0)
+        
+        costs = None
+        if include_costs:
+            cf = self.cost_factors
+            costs = np.column_stack([
+                selling_price * cf.payment_gateway_fee,
+                selling_price * cf.platform_fee,
+                np.full_like(selling_price, cf.packaging_cost),
+                selling_price * cf.returns_buffer,
+                selling_price * cf.gst_rate,
+            ])
+        
+        results = PricingResultBatch(
+            supplier_price=sp,
+            base_markup_percent=base_markup * 100,
+            adjusted_markup_percent=adjusted_markup * 100,
+            selling_price=selling_price,
+            final_price=final_price,
+            profit_margin=profit_margin,
+            costs=costs
+        )
+        if as_results:
+            return results.to_results(self.cost_factors, integral_final_price=apply_psychological)
+        return results
+    
+    @staticmethod
+    def apply_psychological_pricing_array(prices: np.ndarray) -> np.ndarray:
+        """Vectorized apply_psychological_pricing"""
+        p = np.floor(prices)
+        hundreds = p // 100
+        rem = hundreds % 10
+        low = p // 10 * 10 + 9
+        mid = hundreds * 100 + 99
+        high = np.where(rem < 5, hundreds * 100 - 1, (hundreds - rem + 4) * 100 + 99)
+        return np.where(p < 100, low, np.where(p < 1000, mid, high))
+    
+    def bulk_calculate_numba(
+        self,
+        supplier_prices: np.ndarray,
+        cat_ids: np.ndarray,
+        comp_ids: np.ndarray,
+        unique: np.ndarray,
+        apply_psychological: bool = True,
+        dtype: np.dtype = np.float64,
+        include_markup: bool = True
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compiled bulk pricing returning final price, margin and adjusted markup
+
+        Runs the ahead-of-time compiled kernel if pricing_ext is built, else
+        the Numba JIT kernel when numba is installed, otherwise falls back
+        to bulk_calculate_arrays. ``dtype`` selects the input/output float
+        type as in bulk_calculate_arrays. With ``include_markup=False`` the
+        adjusted markup is neither stored nor returned.
+        """
+        dtype = np.dtype(dtype)
+        if AOT_AVAILABLE and dtype in (np.float64, np.float32):
+            kernel = _aot_kernel if dtype == np.float64 else _aot_kernel_f32
+        else:
+            kernel = _load_jit_kernel()
+        if kernel is None:
+            results = self.bulk_calculate_arrays(
+                supplier_prices, cat_ids, comp_ids, unique, apply_psychological,
+                dtype=dtype
+            )
+            output = {
+                'final_price': results.final_price,
+                'profit_margin': results.profit_margin,
+            }
+            if include_markup:
+                output['adjusted_markup_percent'] = results.adjusted_markup_percent
+            return output
+        
+        sp = np.ascontiguousarray(supplier_prices, dtype=dtype)
+        cat_ids = np.ascontiguousarray(cat_ids, dtype=np.int64)
+        comp_ids = np.ascontiguousarray(comp_ids, dtype=np.int64)
+        # The compiled kernels index the adjustment table without bounds checks
+        _check_ids(cat_ids, comp_ids)
+        n = sp.shape[0]
+        out_final = np.empty(n, dtype=dtype)
+        out_margin = np.empty(n, dtype=dtype)
+        out_adj = np.empty(n if include_markup else 0, dtype=dtype)
+        
+        kernel(
+            sp,
+            cat_ids,
+            comp_ids,
+            np.ascontiguousarray(unique, dtype=np.bool_),
+            self._tier_edges_arr,
+            self._tier_markups_arr,
+            self._adj.astype(dtype, copy=False),
+            float(self._variable_rate),
+            float(self.cost_factors.packaging_cost),
+            bool(apply_psychological),
+            out_final,
+            out_margin,
+            out_adj
         )
+        output = {
+            'final_price': out_final,
+            'profit_margin': out_margin,
+        }
+        if include_markup:
+            output['adjusted_markup_percent'] = out_adj
+        return output
     
     def bulk_calculate(self, products: List[Dict]) -> List[PricingResult]:
         """Calculate prices for multiple products"""
-        results = []
-        for product in products:
-            result = self.calculate_price(
-                supplier_price=product['supplier_price'],
-                category=ProductCategory(product.get('category', 'generic')),
-                competition=CompetitionLevel(product.get('competition', 'medium')),
-                has_unique_value=product.get('has_unique_value', False)
+        n = len(products)
+        supplier_prices = [product['supplier_price'] for product in products]
+        try:
+            cat_ids = np.fromiter(
+                (_CATEGORY_BY_NAME[product.get('category', 'generic')] for product in products),
+                dtype=np.int8, count=n
             )
-            results.append(result)
-        return results
+        except KeyError as exc:
+            raise ValueError(f"{exc.args[0]!r} is not a valid ProductCategory") from None
+        try:
+            comp_ids = np.fromiter(
+                (_COMPETITION_BY_NAME[product.get('competition', 'medium')] for product in products),
+                dtype=np.int8, count=n
+            )
+        except KeyError as exc:
+            raise ValueError(f"{exc.args[0]!r} is not a valid CompetitionLevel") from None
+        unique = np.fromiter(
+            (product.get('has_unique_value', False) for product in products), dtype=bool, count=n
+        )
+        batch = self.bulk_calculate_arrays(supplier_prices, cat_ids, comp_ids, unique)
+        return batch.to_results(
+            self.cost_factors, supplier_prices=supplier_prices, integral_final_price=True
+        )
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+"""
+Ahead-of-time build of the bulk pricing kernel
+Run `python pricing_ext_build.py` to produce the pricing_ext extension module,
+which bulk_calculate_numba then uses without JIT warm-up (or numba) at runtime
+"""
+
+from numba.pycc import CC
+
+from pricing_kernel import pricing_kernel
+
+cc = CC('pricing_ext')
+
+# sp, cat_id, comp_id, uniq, tier_edges, tier_markups, adj, variable_rate,
+# packaging_cost, apply_psychological, out_final, out_margin, out_adj
+cc.export(
+    'bulk_kernel',
+    'void(f8[::1], i8[::1], i8[::1], b1[::1], f8[::1], f8[::1], f8[:, ::1], f8, f8, b1, f8[::1], f8[::1], f8[::1])'
+)(pricing_kernel)
+cc.export(
+    'bulk_kernel_f32',
+    'void(f4[::1], i8[::1], i8[::1], b1[::1], f8[::1], f8[::1], f4[:, ::1], f8, f8, b1, f4[::1], f4[::1], f4[::1])'
+)(pricing_kernel)
+
+if __name__ == "__main__":
+    cc.compile()
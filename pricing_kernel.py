@@ -0,0 +1,74 @@
+"""
+ViralDeals Pricing Kernel
+Per-row bulk pricing loop shared by the Numba JIT and AOT builds
+"""
+
+import functools
+import types
+
+# Plain loop by default; jit_pricing_kernel swaps in numba.prange. Kept off
+# the import path so importing this module never loads numba.
+prange = range
+
+def pricing_kernel(sp, cat_id, comp_id, uniq, tier_edges, tier_markups, adj,
+                   variable_rate, packaging_cost, apply_psychological,
+                   out_final, out_margin, out_adj):
+    """
+    Per-row pricing over struct-of-arrays input
+
+    Every step for a row runs in one pass with no intermediate arrays; only
+    out_final, out_margin and (if non-empty) out_adj are written.
+    tier_markups[k] applies below tier_edges[k], the last entry above them all.
+    """
+    store_markup = out_adj.shape[0] > 0
+    for i in prange(sp.shape[0]):
+        price = sp[i]
+        
+        # Base markup tier
+        tier = 0
+        while tier < tier_edges.shape[0] and price >= tier_edges[tier]:
+            tier += 1
+        markup = tier_markups[tier]
+        
+        # Adjustments
+        markup *= adj[cat_id[i], comp_id[i]]
+        if uniq[i]:
+            markup *= 1.15
+        if markup < 0.15:
+            markup = 0.15
+        
+        # Selling price and costs
+        selling = price * (1 + markup)
+        costs = selling * variable_rate + packaging_cost
+        final = selling + costs
+        
+        # Psychological pricing on whole rupees (prices are positive)
+        if apply_psychological:
+            whole = int(final)
+            hundreds = whole // 100
+            rem = hundreds % 10
+            if whole < 100:
+                final = whole // 10 * 10 + 9
+            elif whole < 1000:
+                final = hundreds * 100 + 99
+            elif rem < 5:
+                final = hundreds * 100 - 1
+            else:
+                final = (hundreds - rem + 4) * 100 + 99
+        
+        if store_markup:
+            out_adj[i] = markup * 100
+        out_final[i] = final
+        out_margin[i] = (final - price - costs) / final * 100 if final > 0 else 0.0
+
+@functools.lru_cache(maxsize=None)
+def jit_pricing_kernel():
+    """Numba-compiled parallel pricing_kernel, importing numba on first use"""
+    from numba import njit, prange as numba_prange
+    
+    parallel_kernel = types.FunctionType(
+        pricing_kernel.__code__,
+        {**pricing_kernel.__globals__, 'prange': numba_prange},
+        pricing_kernel.__name__
+    )
+    return njit(parallel=True, fastmath=True, cache=True, error_model='numpy')(parallel_kernel)
@@ -6,9 +6,17 @@ from pricing_algorithm import (
     ViralDealsPricingAlgorithm, 
     ProductCategory, 
     CompetitionLevel, 
-    CostFactors
+    CostFactors,
+    COST_COLUMNS,
+    _PRICE_CACHE_SIZE,
+    AOT_AVAILABLE
 )
+import pricing_algorithm
+import gc
 import json
+import threading
+import weakref
+import numpy as np
 
 def test_basic_tiers():
     """Test the basic markup tiers match your requirements"""
@@ -25,16 +33,48 @@ def test_basic_tiers():
         (2500, "Above ₹2000 tier", 20)
     ]
     
-    for price, description, expected_markup in test_cases:
-        result = pricing_algo.calculate_price(price)
+    prices, descriptions, expected_markups = zip(*test_cases)
+    n = len(prices)
+    results = pricing_algo.bulk_calculate_arrays(
+        np.array(prices),
+        np.full(n, ProductCategory.GENERIC),
+        np.full(n, CompetitionLevel.MEDIUM),
+        np.zeros(n, dtype=bool)
+    )
+    
+    for row in zip(prices, descriptions, expected_markups, results.base_markup_percent,
+                   results.final_price, results.profit_margin):
+        price, description, expected_markup, base_markup, final_price, profit_margin = row
         print(f"\n{description} (₹{price}):")
         print(f"  Expected Base Markup: {expected_markup}%")
-        print(f"  Actual Base Markup: {result.base_markup_percent:.1f}%")
-        print(f"  Final Price: ₹{result.final_price:.0f}")
-        print(f"  Profit Margin: {result.profit_margin:.1f}%")
-        
-        # Verify base markup is correct
-        assert abs(result.base_markup_percent - expected_markup) < 1, f"Base markup mismatch for {price}"
+        print(f"  Actual Base Markup: {base_markup:.1f}%")
+        print(f"  Final Price: ₹{final_price:.0f}")
+        print(f"  Profit Margin: {profit_margin:.1f}%")
+    
+    # Verify base markups are correct
+    assert np.allclose(results.base_markup_percent, expected_markups), "Base markup mismatch"
+    
+    # Tier edges, including fractional prices between the listed ranges
+    edge_markups = {
+        99.99: 0.70, 100: 0.60, 299: 0.60, 299.5: 0.60, 300: 0.45, 699.5: 0.45,
+        700: 0.35, 1199.5: 0.35, 1200: 0.25, 2000: 0.25, 2000.5: 0.25, 2001: 0.20
+    }
+    for price, expected in edge_markups.items():
+        assert pricing_algo.get_base_markup(price) == expected, f"Base markup mismatch at ₹{price}"
+    
+    # Edits to BASE_MARKUP_TIERS reach every pricing path
+    class CustomTiers(ViralDealsPricingAlgorithm):
+        BASE_MARKUP_TIERS = [(100, 499, 0.50), (500, float('inf'), 0.30)]
+        BELOW_TIERS_MARKUP = 0.80
+    
+    custom_algo = CustomTiers()
+    custom_prices = np.array([50.0, 100.0, 499.5, 500.0, 3000.0])
+    custom_expected = [80, 50, 50, 30, 30]
+    n = len(custom_prices)
+    ids = (np.full(n, ProductCategory.GENERIC), np.full(n, CompetitionLevel.MEDIUM), np.zeros(n, dtype=bool))
+    assert [custom_algo.calculate_price(p).base_markup_percent for p in custom_prices] == custom_expected
+    assert np.allclose(custom_algo.bulk_calculate_arrays(custom_prices, *ids).base_markup_percent, custom_expected)
+    assert np.allclose(custom_algo.bulk_calculate_numba(custom_prices, *ids)['adjusted_markup_percent'], custom_expected)
     
     print("\n✅ All basic tier tests passed!")
 
@@ -61,6 +101,59 @@ def test_category_adjustments():
         print(f"  Final Price: ₹{result.final_price:.0f}")
         print(f"  Profit Margin: {result.profit_margin:.1f}%")
 
+def test_adjustment_tables():
+    """Test the adjustment tuples line up with the enum ordinals"""
+    expected_category = {
+        ProductCategory.ELECTRONICS: 0.85,
+        ProductCategory.FASHION: 1.15,
+        ProductCategory.HOME_KITCHEN: 1.0,
+        ProductCategory.BEAUTY: 1.2,
+        ProductCategory.SPORTS: 0.9,
+        ProductCategory.BOOKS: 0.7,
+        ProductCategory.TOYS: 1.1,
+        ProductCategory.GENERIC: 1.0
+    }
+    expected_competition = {
+        CompetitionLevel.LOW: 1.2,
+        CompetitionLevel.MEDIUM: 1.0,
+        CompetitionLevel.HIGH: 0.85,
+        CompetitionLevel.VERY_HIGH: 0.7
+    }
+    
+    assert len(ViralDealsPricingAlgorithm.CATEGORY_ADJUSTMENTS) == len(ProductCategory)
+    assert len(ViralDealsPricingAlgorithm.COMPETITION_ADJUSTMENTS) == len(CompetitionLevel)
+    for category in ProductCategory:
+        assert ViralDealsPricingAlgorithm.CATEGORY_ADJUSTMENTS[category] == expected_category[category], category.key
+    for competition in CompetitionLevel:
+        assert ViralDealsPricingAlgorithm.COMPETITION_ADJUSTMENTS[competition] == expected_competition[competition], competition.key
+    
+    # Out-of-range ints are rejected by the scalar path too
+    for bad_args in ({"category": -1}, {"category": len(ProductCategory)}, {"competition": -1}):
+        try:
+            ViralDealsPricingAlgorithm().calculate_price(500, **bad_args)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"calculate_price accepted {bad_args}")
+    
+    # String keys parse exactly as the old Enum values did, in both paths
+    assert ProductCategory("home_kitchen") is ProductCategory.HOME_KITCHEN
+    assert CompetitionLevel("very_high") is CompetitionLevel.VERY_HIGH
+    pricing_algo = ViralDealsPricingAlgorithm()
+    for bad_key in ("FASHION", "Fashion"):
+        for parse in (
+            lambda: ProductCategory(bad_key),
+            lambda: pricing_algo.bulk_calculate([{"supplier_price": 500, "category": bad_key}])
+        ):
+            try:
+                parse()
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{bad_key!r} parsed as a ProductCategory")
+    
+    print("\n✅ Adjustment tables match enum order")
+
 def test_competition_levels():
     """Test competition level adjustments"""
     print("\n🏆 Testing Competition Level Adjustments")
@@ -99,6 +192,11 @@ def test_psychological_pricing():
         print(f"\nSupplier Price: ₹{price}")
         print(f"  Without Psychological: ₹{result_without.final_price:.0f}")
         print(f"  With Psychological: ₹{result_with.final_price:.0f}")
+    
+    # Whole-rupee rounding at and around each range boundary
+    expected_points = {85.7: 89, 99.99: 99, 100: 199, 999.5: 999, 1000: 999, 1234.9: 1199, 1678: 1499}
+    for price, expected in expected_points.items():
+        assert pricing_algo.apply_psychological_pricing(price) == expected, f"Psychological price mismatch for {price}"
 
 def test_cost_breakdown():
     """Test detailed cost breakdown"""
@@ -116,9 +214,96 @@ def test_cost_breakdown():
     for cost_type, amount in result.cost_breakdown.items():
         print(f"  {cost_type.replace('_', ' ').title()}: ₹{amount:.2f}")
     
-    print(f"\nTotal Additional Costs: ₹{sum(result.cost_breakdown.values()):.2f}")
+    print(f"\nTotal Additional Costs: ₹{result.total_additional_costs:.2f}")
+    assert abs(result.total_additional_costs - sum(result.cost_breakdown.values())) < 1e-9
+    assert result.to_dict()['cost_breakdown'] == result.cost_breakdown
     print(f"Profit Margin: {result.profit_margin:.1f}%")
 
+def test_price_cache():
+    """Test calculate_price memoisation"""
+    pricing_algo = ViralDealsPricingAlgorithm()
+    
+    # A hit returns the identical (frozen) result
+    first = pricing_algo.calculate_price(750, ProductCategory.BEAUTY, has_unique_value=True)
+    assert pricing_algo.calculate_price(750, ProductCategory.BEAUTY, has_unique_value=True) is first
+    
+    # Instances with different cost factors never share entries
+    other_algo = ViralDealsPricingAlgorithm(CostFactors(platform_fee=0.10))
+    other = other_algo.calculate_price(750, ProductCategory.BEAUTY, has_unique_value=True)
+    assert other is not first and other.cost_factors == CostFactors(platform_fee=0.10)
+    assert other.total_additional_costs != first.total_additional_costs
+    
+    # Reassigning cost factors drops the cached results
+    pricing_algo.cost_factors = CostFactors(platform_fee=0.10)
+    repriced = pricing_algo.calculate_price(750, ProductCategory.BEAUTY, has_unique_value=True)
+    assert repriced is not first and repriced == other
+    
+    # A hit refreshes recency, so the entry survives a full cache of newer ones
+    lru_algo = ViralDealsPricingAlgorithm()
+    kept = lru_algo.calculate_price(100)
+    for price in range(101, 100 + _PRICE_CACHE_SIZE):
+        lru_algo.calculate_price(price)
+    assert lru_algo.calculate_price(100) is kept
+    lru_algo.calculate_price(100 + _PRICE_CACHE_SIZE)
+    assert lru_algo.calculate_price(100) is kept, "Recently used entry was evicted"
+    assert lru_algo.calculate_price(101) is not None
+    
+    # Concurrent misses and evictions past the cache size don't raise
+    shared_algo = ViralDealsPricingAlgorithm()
+    errors = []
+    
+    def price_many(seed):
+        rng = np.random.default_rng(seed)
+        try:
+            for price in rng.uniform(10, 5000, 3000).round(2):
+                result = shared_algo.calculate_price(float(price))
+                assert result.supplier_price == float(price)
+        except Exception as exc:  # Collected and re-raised in the main thread
+            errors.append(exc)
+    
+    threads = [threading.Thread(target=price_many, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, f"Threaded pricing failed: {errors[0]!r}"
+    
+    # The cache does not keep its instance alive through a reference cycle
+    gc.disable()
+    try:
+        algo_ref = weakref.ref(pricing_algo)
+        del pricing_algo
+        assert algo_ref() is None, "Pricing algorithm only freed by the cyclic GC"
+    finally:
+        gc.enable()
+    
+    print("\n✅ Price cache hits, isolation and invalidation behave")
+
+def test_cost_factors_reassignment():
+    """Test that assigning new cost factors takes effect immediately"""
+    pricing_algo = ViralDealsPricingAlgorithm()
+    pricing_algo.calculate_price(501)  # Warm the derived state and cache
+    
+    new_costs = CostFactors(gst_rate=0.05)
+    pricing_algo.cost_factors = new_costs
+    result = pricing_algo.calculate_price(501)
+    expected = ViralDealsPricingAlgorithm(new_costs).calculate_price(501)
+    
+    assert result.final_price == expected.final_price, "Reassigned cost factors were ignored"
+    assert result.profit_margin == expected.profit_margin
+    assert result.total_additional_costs == expected.total_additional_costs
+    assert result.cost_breakdown == expected.cost_breakdown
+    
+    batch = pricing_algo.bulk_calculate_arrays([501], [ProductCategory.GENERIC], [CompetitionLevel.MEDIUM], [False])
+    assert batch.final_price[0] == expected.final_price
+    
+    # Non-finite factors propagate instead of breaking the specialised cost function
+    for bad_costs in (CostFactors(gst_rate=float('nan')), CostFactors(packaging_cost=float('inf'))):
+        result = ViralDealsPricingAlgorithm(bad_costs).calculate_price(501, apply_psychological=False)
+        assert not np.isfinite(result.final_price)
+    
+    print("\n✅ Reassigned cost factors take effect")
+
 def demo_real_world_scenarios():
     """Demo with real-world product scenarios"""
     print("\n🌟 Real-World Scenarios Demo")
@@ -167,8 +352,8 @@ def demo_real_world_scenarios():
         
         print(f"\n📦 {scenario['name']}")
         print(f"   Supplier Cost: ₹{scenario['supplier_price']}")
-        print(f"   Category: {scenario['category'].value.replace('_', ' ').title()}")
-        print(f"   Competition: {scenario['competition'].value.replace('_', ' ').title()}")
+        print(f"   Category: {scenario['category'].key.replace('_', ' ').title()}")
+        print(f"   Competition: {scenario['competition'].key.replace('_', ' ').title()}")
         print(f"   Unique Value: {'Yes' if scenario['has_unique_value'] else 'No'}")
         print(f"   → Final Price: ₹{result.final_price:.0f}")
         print(f"   → Markup: {result.adjusted_markup_percent:.1f}%")
@@ -206,6 +391,106 @@ def test_bulk_processing():
         print(f"\nProduct {i+1}: ₹{products[i]['supplier_price']} → ₹{result.final_price:.0f}")
         print(f"  Markup: {result.adjusted_markup_percent:.1f}%, Margin: {result.profit_margin:.1f}%")
 
+def test_bulk_arrays_match_scalar():
+    """Test the vectorized bulk path agrees with calculate_price"""
+    print("\n⚡ Testing Vectorized Bulk Pricing")
+    print("=" * 50)
+    
+    pricing_algo = ViralDealsPricingAlgorithm()
+    
+    products = [
+        {"supplier_price": price, "category": category.key,
+         "competition": competition.key, "has_unique_value": unique}
+        for price in [50, 85, 100, 299, 300, 699, 700, 1199, 1200, 2000, 2001, 5000]
+        for category in ProductCategory
+        for competition in CompetitionLevel
+        for unique in (False, True)
+    ]
+    
+    results = pricing_algo.bulk_calculate(products)
+    
+    for product, result in zip(products, results):
+        expected = pricing_algo.calculate_price(
+            product["supplier_price"],
+            category=ProductCategory(product["category"]),
+            competition=CompetitionLevel(product["competition"]),
+            has_unique_value=product["has_unique_value"]
+        )
+        assert abs(result.adjusted_markup_percent - expected.adjusted_markup_percent) < 1e-9
+        assert abs(result.final_price - expected.final_price) < 1e-6, f"Final price mismatch for {product}"
+        assert abs(result.profit_margin - expected.profit_margin) < 1e-6
+        # Same types as the scalar API, so exports don't differ
+        assert type(result.final_price) is type(expected.final_price)
+        assert type(result.supplier_price) is type(expected.supplier_price)
+        assert json.dumps(result.to_dict()) == json.dumps(expected.to_dict()), f"Export mismatch for {product}"
+    
+    batch = pricing_algo.bulk_calculate_arrays(
+        [1000], [0], [0], [False], include_costs=True
+    )
+    expected_costs = pricing_algo.calculate_price(
+        1000, ProductCategory.ELECTRONICS, CompetitionLevel.LOW
+    ).cost_breakdown
+    assert np.allclose(batch.costs[0], [expected_costs[key] for key in COST_COLUMNS])
+    
+    # Array containers compare by identity rather than element-wise
+    other = pricing_algo.bulk_calculate_arrays([1000], [0], [0], [False], include_costs=True)
+    assert batch == batch and batch != other
+    assert len({batch, other}) == 2
+    
+    print(f"✅ {len(results)} vectorized results match scalar pricing")
+
+def test_bulk_numba_matches_arrays():
+    """Test the compiled bulk kernel agrees with the NumPy path"""
+    print("\n🚄 Testing Compiled Bulk Kernel")
+    print("=" * 50)
+    
+    pricing_algo = ViralDealsPricingAlgorithm()
+    
+    rng = np.random.default_rng(42)
+    n = 10_000
+    supplier_prices = rng.uniform(10, 5000, n).round()
+    cat_ids = rng.integers(0, len(ProductCategory), n)
+    comp_ids = rng.integers(0, len(CompetitionLevel), n)
+    unique = rng.random(n) < 0.3
+    
+    expected = pricing_algo.bulk_calculate_arrays(supplier_prices, cat_ids, comp_ids, unique)
+    actual = pricing_algo.bulk_calculate_numba(supplier_prices, cat_ids, comp_ids, unique)
+    
+    for key in ('adjusted_markup_percent', 'final_price', 'profit_margin'):
+        assert np.allclose(actual[key], getattr(expected, key)), f"{key} mismatch"
+    
+    actual32 = pricing_algo.bulk_calculate_numba(
+        supplier_prices, cat_ids, comp_ids, unique, dtype=np.float32
+    )
+    expected32 = pricing_algo.bulk_calculate_arrays(
+        supplier_prices, cat_ids, comp_ids, unique, dtype=np.float32
+    )
+    assert actual32['final_price'].dtype == expected32.final_price.dtype == np.float32
+    assert np.allclose(actual32['adjusted_markup_percent'], expected.adjusted_markup_percent)
+    assert np.allclose(expected32.adjusted_markup_percent, expected.adjusted_markup_percent)
+    
+    prices_only = pricing_algo.bulk_calculate_numba(
+        supplier_prices, cat_ids, comp_ids, unique, include_markup=False
+    )
+    assert 'adjusted_markup_percent' not in prices_only
+    assert np.array_equal(prices_only['final_price'], actual['final_price'])
+    
+    for bad_cat, bad_comp in (([len(ProductCategory)], [1]), ([-1], [1]), ([0], [len(CompetitionLevel)]), ([0], [-1])):
+        for bulk in (pricing_algo.bulk_calculate_arrays, pricing_algo.bulk_calculate_numba):
+            try:
+                bulk(np.array([500.0]), np.array(bad_cat), np.array(bad_comp), np.array([False]))
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{bulk.__name__} accepted ids {bad_cat}, {bad_comp}")
+    
+    if AOT_AVAILABLE:
+        backend = "AOT extension"
+    else:
+        # Read at call time: a numba that fails to import clears the flag
+        backend = "numba" if pricing_algorithm.NUMBA_AVAILABLE else "NumPy fallback"
+    print(f"✅ {n} compiled results match vectorized pricing ({backend})")
+
 def generate_pricing_report():
     """Generate a comprehensive pricing report"""
     print("\n📈 Comprehensive Pricing Report")
@@ -220,9 +505,18 @@ def generate_pricing_report():
     print("Supplier Price | Base Markup | Final Price | Profit Margin")
     print("-" * 55)
     
-    for price in price_ranges:
-        result = pricing_algo.calculate_price(price)
-        print(f"₹{price:>10} | {result.base_markup_percent:>9.1f}% | ₹{result.final_price:>8.0f} | {result.profit_margin:>10.1f}%")
+    n = len(price_ranges)
+    results = pricing_algo.bulk_calculate_arrays(
+        np.array(price_ranges),
+        np.full(n, ProductCategory.GENERIC),
+        np.full(n, CompetitionLevel.MEDIUM),
+        np.zeros(n, dtype=bool)
+    )
+    
+    for price, base_markup, final_price, profit_margin in zip(
+        price_ranges, results.base_markup_percent, results.final_price, results.profit_margin
+    ):
+        print(f"₹{price:>10} | {base_markup:>9.1f}% | ₹{final_price:>8.0f} | {profit_margin:>10.1f}%")
 
 if __name__ == "__main__":
     print("🚀 ViralDeals Pricing Algorithm Test Suite")
@@ -231,11 +525,16 @@ if __name__ == "__main__":
     # Run all tests
     test_basic_tiers()
     test_category_adjustments()
+    test_adjustment_tables()
     test_competition_levels()
     test_psychological_pricing()
     test_cost_breakdown()
+    test_cost_factors_reassignment()
+    test_price_cache()
     demo_real_world_scenarios()
     test_bulk_processing()
+    test_bulk_arrays_match_scalar()
+    test_bulk_numba_matches_arrays()
     generate_pricing_report()
     
     print("\n🎉 All tests completed successfully!")